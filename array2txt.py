@@ -1,10 +1,12 @@
 from __future__ import annotations
 import argparse
+import os
+from multiprocessing import Pool
 from pathlib import Path
 import numpy as np
 
 
-def array2txt(arr: np.ndarray, txt_path: str) -> None:
+def array2txt(arr: np.ndarray, txt_path: str) -> int:
     """
     Convert a dense tracklet array back into MOT-style txt format.
 
@@ -19,41 +21,72 @@ def array2txt(arr: np.ndarray, txt_path: str) -> None:
     Args:
         arr (np.ndarray): Dense tracklet array (num_tracks+1, num_frames+1, 4).
         txt_path (str): Path to the output txt file.
+
+    Returns:
+        int: Number of lines (bboxes) written.
     """
-    num_tracks, num_frames, _ = arr.shape
     path = Path(txt_path)
     path.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(path, "w", encoding="utf-8") as f:
-        # Iterate over tracks and frames (skip index 0 because of padding)
-        for frame in range(1, num_frames):
-            for tid in range(1, num_tracks):
-                bbox = arr[tid, frame]
-                if np.any(np.isnan(bbox)):
-                    continue
-                x, y, w, h = bbox.tolist()
-                f.write(f"{frame},{tid},{x:.2f},{y:.2f},{w:.2f},{h:.2f},1,1,1\n")
+    # Locate every complete bbox in one scan (skip index 0 because of padding; a NaN in
+    # any of x, y, w, h means no bbox, same as visualize_tracklets)
+    mask = ~np.isnan(arr[1:, 1:]).any(axis=-1)
+    tids, frames = np.nonzero(mask)
+    bboxes = arr[1:, 1:][mask]
+
+    # Rows are ordered by frame first, then by track id
+    order = np.lexsort((tids, frames))
+    columns = [frames[order] + 1, tids[order] + 1, *bboxes[order].T]
+
+    # Format column-wise (map drives str.format without a per-row tuple) and write in a single call
+    fmt = "{:d},{:d},{:.2f},{:.2f},{:.2f},{:.2f},1,1,1\n".format
+    path.write_text("".join(map(fmt, *(col.tolist() for col in columns))), encoding="utf-8")
+    return int(order.size)
+
+
+def convert_sequence(sequence: str, arr_dir: str, output_dir: str) -> tuple[Path, tuple[int, ...], int]:
+    """
+    Convert {arr_dir}/{sequence}.npy into {output_dir}/{sequence}.txt.
+
+    Args:
+        sequence (str): Sequence name (e.g., seq01).
+        arr_dir (str): Folder containing {sequence}.npy.
+        output_dir (str): Folder to save {sequence}.txt.
+
+    Returns:
+        txt_path (Path): Path to the written txt file.
+        shape (tuple[int, ...]): Shape of the converted array.
+        n_written (int): Number of lines written.
+    """
+    arr_path = Path(arr_dir) / f"{sequence}.npy"
+    arr = np.load(arr_path, mmap_mode="r")
+    txt_path = Path(output_dir) / f"{sequence}.txt"
+
+    n_written = array2txt(arr, str(txt_path))
+    return txt_path, arr.shape, n_written
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Convert dense numpy array to MOT-style txt.")
-    parser.add_argument("sequence", type=str, help="Sequence name (e.g., seq01).")
+    parser = argparse.ArgumentParser(description="Convert dense numpy arrays to MOT-style txt.")
+    parser.add_argument("sequences", type=str, nargs="+", help="Sequence name(s) (e.g., seq01 seq02).")
     parser.add_argument("--arr_dir", type=str, default="tracklets_array",
                         help="Folder containing {sequence}.npy (default: tracklets_array).")
     parser.add_argument("--output_dir", type=str, default="final_tracklets",
                         help="Folder to save {sequence}.txt (default: final_tracklets).")
     args = parser.parse_args()
 
-    arr_path = Path(args.arr_dir) / f"{args.sequence}.npy"
-    arr = np.load(arr_path)
-    txt_path = Path(args.output_dir) / f"{args.sequence}.txt"
-
-    array2txt(arr, str(txt_path))
-
-    print(f"Saved txt to: {txt_path}")
-    print(f"array shape: {arr.shape}  (tracks+1, frames+1, 4)")
-    print(f"lines written: {sum(1 for _ in open(txt_path, 'r', encoding='utf-8'))}")
+    jobs = [(seq, args.arr_dir, args.output_dir) for seq in args.sequences]
+    if len(jobs) == 1:
+        results = [convert_sequence(*jobs[0])]
+    else:
+        # Convert several sequences in parallel, one worker per sequence up to the CPU count
+        with Pool(min(len(jobs), os.cpu_count() or 1)) as pool:
+            results = pool.starmap(convert_sequence, jobs)
 
+    for txt_path, shape, n_written in results:
+        print(f"Saved txt to: {txt_path}")
+        print(f"array shape: {shape}  (tracks+1, frames+1, 4)")
+        print(f"lines written: {n_written}")
 
 if __name__ == "__main__":
     main()
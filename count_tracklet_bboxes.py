@@ -1,5 +1,8 @@
 import argparse
+import os
+from multiprocessing import Pool
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 
@@ -18,22 +21,28 @@ def count_tracklet_bboxes(txt_path: str, tracklet_id: int) -> int:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {txt_path}")
 
-    df = pd.read_csv(path, header=None)
-    return df[df[1] == tracklet_id].shape[0]
+    # Only the track_id column is needed, so skip parsing the bbox/score columns
+    df = pd.read_csv(path, header=None, usecols=[1], dtype=np.int32, engine="c")
+    return int((df[1].to_numpy() == tracklet_id).sum())
 
 
 def main():
     parser = argparse.ArgumentParser(description="Count bboxes of a specific tracklet ID.")
-    parser.add_argument("sequence", type=str, help="Sequence name (e.g., seq01).")
+    parser.add_argument("sequences", type=str, nargs="+", help="Sequence name(s) (e.g., seq01 seq02).")
     parser.add_argument("tracklet_id", type=int, help="Tracklet ID to count.")
     parser.add_argument("--txt_dir", type=str, default="gta_tracklets",
                         help="Folder that contains {sequence}.txt (default: gta_tracklets)")
     args = parser.parse_args()
 
-    txt_path = Path(args.txt_dir) / f"{args.sequence}.txt"
-    count = count_tracklet_bboxes(txt_path, args.tracklet_id)
-    print(f"Tracklet {args.tracklet_id} has {count} bboxes in {args.sequence}.")
+    jobs = [(Path(args.txt_dir) / f"{seq}.txt", args.tracklet_id) for seq in args.sequences]
+    if len(jobs) == 1:
+        counts = [count_tracklet_bboxes(*jobs[0])]
+    else:
+        with Pool(min(len(jobs), os.cpu_count() or 1)) as pool:
+            counts = pool.starmap(count_tracklet_bboxes, jobs)
 
+    for seq, count in zip(args.sequences, counts):
+        print(f"Tracklet {args.tracklet_id} has {count} bboxes in {seq}.")
 
 if __name__ == "__main__":
     main()
@@ -1,5 +1,8 @@
 import argparse
+import os
+from multiprocessing import Pool
 from pathlib import Path
+import numpy as np
 import pandas as pd
 
 
@@ -17,21 +20,27 @@ def count_unique_ids(txt_path: str) -> int:
     if not path.exists():
         raise FileNotFoundError(f"File not found: {txt_path}")
 
-    df = pd.read_csv(path, header=None)
-    return df[1].nunique()
+    # Only the track_id column is needed, so skip parsing the bbox/score columns
+    ids = pd.read_csv(path, header=None, usecols=[1], dtype=np.int32, engine="c")[1].to_numpy()
+    return int(np.unique(ids).size)
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Count unique IDs in a sequence annotation file.")
-    parser.add_argument("sequence", type=str, help="Sequence name (e.g., seq01).")
+    parser = argparse.ArgumentParser(description="Count unique IDs in sequence annotation files.")
+    parser.add_argument("sequences", type=str, nargs="+", help="Sequence name(s) (e.g., seq01 seq02).")
     parser.add_argument("--txt_dir", type=str, default="gta_tracklets",
                         help="Folder that contains {sequence}.txt (default: gta_tracklets)")
     args = parser.parse_args()
 
-    txt_path = Path(args.txt_dir) / f"{args.sequence}.txt"
-    unique_ids = count_unique_ids(txt_path)
-    print(f"Unique IDs in {args.sequence}: {unique_ids}")
+    txt_paths = [Path(args.txt_dir) / f"{seq}.txt" for seq in args.sequences]
+    if len(txt_paths) == 1:
+        counts = [count_unique_ids(txt_paths[0])]
+    else:
+        with Pool(min(len(txt_paths), os.cpu_count() or 1)) as pool:
+            counts = pool.map(count_unique_ids, txt_paths)
 
+    for seq, unique_ids in zip(args.sequences, counts):
+        print(f"Unique IDs in {seq}: {unique_ids}")
 
 if __name__ == "__main__":
     main()
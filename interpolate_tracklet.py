@@ -1,8 +1,100 @@
 from __future__ import annotations
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import cv2
+from visualize_tracklets import JPEG_PARAMS
+
+
+# Reduced-resolution JPEG decode flags, keyed by downscale factor
+_IMREAD_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+
+# Worker threads that decode, crop and encode interpolated frames
+_NUM_WORKERS = os.cpu_count() or 1
+
+
+def _frame_size(img_paths: list[Path]) -> tuple[int, int]:
+    """
+    Get the frame size of a sequence from its first readable frame image.
+
+    Args:
+        img_paths (list[Path]): Candidate frame images, all of the same sequence.
+
+    Returns:
+        tuple[int, int]: (W, H) of the frames, or (0, 0) if none of them could be read.
+    """
+    for img_path in img_paths:
+        if img_path.exists():
+            img = cv2.imread(str(img_path))
+            if img is not None:
+                H, W = img.shape[:2]
+                return W, H
+    return 0, 0
+
+
+def _crop_and_save(
+    img_path: Path,
+    bbox: np.ndarray,
+    resize_w: int,
+    resize_h: int,
+    out_path: Path,
+    frame_size: tuple[int, int],
+) -> None:
+    """
+    Crop a bbox from a frame image, resize it and save it as jpg. Missing frames are skipped.
+
+    Args:
+        img_path (Path): Path to the frame image.
+        bbox (np.ndarray): Bbox [x, y, w, h] in pixel coordinates.
+        resize_w (int): Width to resize the cropped bbox image.
+        resize_h (int): Height to resize the cropped bbox image.
+        out_path (Path): Path to save the resized crop.
+        frame_size (tuple[int, int]): Full-resolution (W, H) of the frame image.
+    """
+    # Save resized cropped image for the interpolated bbox if the frame exists on disk
+    if not img_path.exists():
+        return
+
+    # Decode at reduced resolution when the visible (clamped) crop would still be at least
+    # resize_w x resize_h; boxes cut off at the frame edge must not be upscaled
+    frame_w, frame_h = frame_size
+    visible_w = min(bbox[0] + bbox[2], frame_w) - max(bbox[0], 0)
+    visible_h = min(bbox[1] + bbox[3], frame_h) - max(bbox[1], 0)
+    scale = 1
+    for s in (8, 4, 2):
+        if visible_w / s >= resize_w and visible_h / s >= resize_h:
+            scale = s
+            break
+
+    img = cv2.imread(str(img_path), _IMREAD_FLAGS[scale])
+    if img is None:
+        return
+
+    H, W = img.shape[:2]
+    x, y, w, h = bbox / scale
+
+    # Floor/ceil to int bounds and clamp to image bounds
+    x0, y0 = np.clip(np.floor([x, y]).astype(int), 0, [W - 1, H - 1]).tolist()
+    x1, y1 = np.clip(np.ceil([x + w, y + h]).astype(int), 0, [W, H]).tolist()
+
+    # Skip invalid or empty crops after clamping
+    if x1 <= x0 or y1 <= y0:
+        return
+    crop = img[y0:y1, x0:x1]
+    if crop.size == 0:
+        return
+
+    # Resize to fixed size (same policy as visualize_tracklets)
+    resized = cv2.resize(crop, (resize_w, resize_h), interpolation=cv2.INTER_AREA)
+    cv2.imwrite(str(out_path), resized, JPEG_PARAMS)
 
 
 def interpolate_tracklet(
@@ -19,7 +111,8 @@ def interpolate_tracklet(
     For each interpolated frame, save a resized crop (resize_w x resize_h) to the tracklet folder.
 
     Args:
-        arr (np.ndarray): Tracklet array of shape (num_tracks+1, num_frames+1, 4).
+        arr (np.ndarray): Tracklet array of shape (num_tracks+1, num_frames+1, 4), updated in place
+            (e.g. a writable np.memmap).
         tid (int): Tracklet ID to interpolate (1-based).
         max_gap (int): Maximum allowed gap length (inclusive) for interpolation.
         resize_w (int): Width to resize cropped bbox images.
@@ -28,79 +121,65 @@ def interpolate_tracklet(
         tracklets_root (str): Root folder containing per-tracklet folders named as tracklet_XXXX.
 
     Returns:
-        arr_new (np.ndarray): Updated array with interpolated bboxes filled in for gaps <= max_gap.
+        arr (np.ndarray): The same array, with interpolated bboxes filled in for gaps <= max_gap.
     """
     num_tracks, num_frames, _ = arr.shape
     if not (1 <= tid < num_tracks):
         raise ValueError(f"tid out of range: {tid} (valid: 1..{num_tracks-1})")
 
-    JPEG_QUALITY = 95
-    arr_new = arr.copy()
     tracklet_dir = Path(tracklets_root) / f"tracklet_{tid:04d}"
     tracklet_dir.mkdir(parents=True, exist_ok=True)
 
     img_dir_path = Path(img_dir)
 
     # Frames where this tracklet has a bbox (ignore padding index 0)
-    frames = np.where(~np.isnan(arr_new[tid, :, 0]))[0]
-    frames = frames[frames >= 1]
+    frames = np.flatnonzero(~np.isnan(arr[tid, 1:, 0])) + 1
     if frames.size < 2:
-        return arr_new  # nothing to interpolate
-
-    for i in range(frames.size - 1):
-        t = int(frames[i])
-        t_next = int(frames[i + 1])
-        gap = t_next - t
-
-        # Only interpolate for gaps 2..max_gap (strictly missing in-between)
-        if 1 < gap <= max_gap:
-            bbox_start = arr_new[tid, t, :].astype(float)
-            bbox_end = arr_new[tid, t_next, :].astype(float)
-
-            print(f"Interpolating tracklet {tid} from frame {t} to {t_next} (gap={gap})")
-
-            for k in range(1, gap):
-                f = t + k
-                alpha = k / gap
-                bbox_interp = (1.0 - alpha) * bbox_start + alpha * bbox_end
-                arr_new[tid, f, :] = bbox_interp
-
-                # Save resized cropped image for the interpolated bbox if the frame exists on disk
-                img_path = img_dir_path / f"{f:06d}.jpg"
-                if not img_path.exists():
-                    continue
-
-                img = cv2.imread(str(img_path))
-                if img is None:
-                    continue
-
-                H, W = img.shape[:2]
-                x, y, w, h = bbox_interp
-                x0 = int(np.floor(x))
-                y0 = int(np.floor(y))
-                x1 = int(np.ceil(x + w))
-                y1 = int(np.ceil(y + h))
-
-                # Clamp to image bounds
-                x0 = max(0, min(x0, W - 1))
-                y0 = max(0, min(y0, H - 1))
-                x1 = max(0, min(x1, W))
-                y1 = max(0, min(y1, H))
-
-                # Skip invalid or empty crops after clamping
-                if x1 <= x0 or y1 <= y0:
-                    continue
-                crop = img[y0:y1, x0:x1]
-                if crop.size == 0:
-                    continue
-
-                # Resize to fixed size (same policy as visualize_tracklets)
-                resized = cv2.resize(crop, (resize_w, resize_h), interpolation=cv2.INTER_AREA)
-
-                out_path = tracklet_dir / f"{f:06d}.jpg"
-                cv2.imwrite(str(out_path), resized, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
-
-    return arr_new
+        return arr  # nothing to interpolate
+
+    # Only interpolate for gaps 2..max_gap (strictly missing in-between)
+    gaps = np.diff(frames)
+    sel = (gaps > 1) & (gaps <= max_gap)
+    starts, ends, gaps = frames[:-1][sel], frames[1:][sel], gaps[sel]
+
+    for t, t_next, gap in zip(starts.tolist(), ends.tolist(), gaps.tolist()):
+        print(f"Interpolating tracklet {tid} from frame {t} to {t_next} (gap={gap})")
+
+    # Interpolate every missing frame of every gap at once: (num_missing, 4)
+    n_missing = gaps - 1
+    gap_idx = np.repeat(np.arange(gaps.size), n_missing)
+    # Offset of each missing frame inside its gap (1..gap-1)
+    k = np.arange(n_missing.sum()) - np.repeat(np.cumsum(n_missing) - n_missing, n_missing) + 1
+    interp_frames = starts[gap_idx] + k
+    alphas = (k / gaps[gap_idx])[:, None]
+    bbox_start = arr[tid, starts[gap_idx], :].astype(float)
+    bbox_end = arr[tid, ends[gap_idx], :].astype(float)
+    bboxes_interp = (1.0 - alphas) * bbox_start + alphas * bbox_end
+
+    interp_paths = [img_dir_path / f"{f:06d}.jpg" for f in interp_frames.tolist()]
+    frame_size = _frame_size(interp_paths)
+
+    # Decode, crop and encode the interpolated frames in parallel (cv2 releases the GIL)
+    with ThreadPoolExecutor(max_workers=_NUM_WORKERS) as executor:
+        futures = [
+            executor.submit(
+                _crop_and_save,
+                img_path,
+                bbox_interp,
+                resize_w,
+                resize_h,
+                tracklet_dir / img_path.name,
+                frame_size,
+            )
+            for img_path, bbox_interp in zip(interp_paths, bboxes_interp)
+        ]
+        for future in futures:
+            future.result()
+
+    # Write the bboxes only once every crop is saved, so a failed run leaves arr unchanged
+    arr[tid, interp_frames, :] = bboxes_interp
+
+    return arr
 
 
 def main():
@@ -115,14 +194,15 @@ def main():
     args = parser.parse_args()
 
     arr_path = Path(args.arr_dir) / f"{args.sequence}.npy"
-    arr = np.load(arr_path)
+    # Only the interpolated frames of one row change, so update the npy in place
+    arr = np.load(arr_path, mmap_mode="r+")
     img_dir = Path("dataset") / args.sequence / "img1"
     tracklets_root = Path(args.output_dir) / args.sequence
 
     # Keep the same default resize as visualize_tracklets
     resize_w, resize_h = 240, 480
 
-    arr_new = interpolate_tracklet(
+    interpolate_tracklet(
         arr=arr,
         tid=args.tracklet_id,
         max_gap=args.max_gap,
@@ -132,11 +212,10 @@ def main():
         tracklets_root=str(tracklets_root),
     )
 
-    # Overwrite the same npy
-    np.save(arr_path, arr_new)
+    arr.flush()
 
     print(f"Interpolated tracklet {args.tracklet_id:04d} (max_gap={args.max_gap}).")
-    print(f"New array shape: {arr_new.shape}")
+    print(f"New array shape: {arr.shape}")
 
 
 if __name__ == "__main__":
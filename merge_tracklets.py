@@ -1,5 +1,6 @@
 from __future__ import annotations
 import argparse
+import os
 from pathlib import Path
 import shutil
 import numpy as np
@@ -29,26 +30,26 @@ def merge_tracklets(arr: np.ndarray, tid_a: int, tid_b: int, tracklets_root: str
     # Validate no overlap on the same frame
     a_has = ~np.isnan(arr[tid_a, :, 0])
     b_has = ~np.isnan(arr[tid_b, :, 0])
-    overlap = np.where(a_has & b_has)[0]
-    overlap = overlap[overlap >= 1]  # ignore padding index 0
-    if overlap.size > 0:
-        offending = ", ".join(str(int(f)) for f in overlap[:10])
+    both = a_has & b_has
+    both[0] = False  # ignore padding index 0
+    n_overlap = int(np.count_nonzero(both))
+    if n_overlap > 0:
+        first = int(np.argmax(both))
         raise ValueError(
-            f"Cannot merge: tracklets {tid_a} and {tid_b} overlap on frames {offending}..."
+            f"Cannot merge: tracklets {tid_a} and {tid_b} overlap on frame {first} (+{n_overlap - 1} more)"
         )
 
     # Create new tracklet ID
     new_tid = num_tracks
 
-    # Expand array
-    arr_new = np.full((num_tracks + 1, num_frames, 4), np.nan, dtype=np.float32)
+    # Expand array: copy existing rows once and only NaN-fill the appended row
+    arr_new = np.empty((num_tracks + 1, num_frames, 4), dtype=np.float32)
     arr_new[:num_tracks, :, :] = arr
+    arr_new[new_tid, :, :] = np.nan
 
-    # Fill new tracklet row with union of tid_a and tid_b
-    a_mask = ~np.isnan(arr[tid_a, :, 0])
-    arr_new[new_tid, a_mask, :] = arr[tid_a, a_mask, :]
-    b_mask = ~np.isnan(arr[tid_b, :, 0])
-    arr_new[new_tid, b_mask, :] = arr[tid_b, b_mask, :]
+    # Fill new tracklet row with union of tid_a and tid_b (reuse the presence masks)
+    arr_new[new_tid, a_has, :] = arr[tid_a, a_has, :]
+    arr_new[new_tid, b_has, :] = arr[tid_b, b_has, :]
 
     # Clear originals
     arr_new[tid_a, :, :] = np.nan
@@ -64,14 +65,19 @@ def merge_tracklets(arr: np.ndarray, tid_a: int, tid_b: int, tracklets_root: str
     def move_frame_images(src_dir: Path, dst_dir: Path) -> None:
         if not src_dir.exists():
             return
-        for p in src_dir.iterdir():
-            if p.suffix.lower() != ".jpg":
-                continue
-            if len(p.stem) != 6 or not p.stem.isdigit():
-                continue
-            dst = dst_dir / p.name
-            if not dst.exists():
-                shutil.move(str(p), str(dst))
+        with os.scandir(src_dir) as it:
+            for entry in it:
+                name = entry.name
+                # Only frame crops named as 000001.jpg, 000002.jpg, ...
+                if len(name) != 10 or name[-4:].lower() != ".jpg" or not name[:6].isdigit():
+                    continue
+                dst = os.path.join(dst_dir, name)
+                if os.path.exists(dst):
+                    continue
+                try:
+                    os.rename(entry.path, dst)  # same filesystem: metadata-only move
+                except OSError:
+                    shutil.move(entry.path, dst)
 
     move_frame_images(old_dir_a, new_dir)
     move_frame_images(old_dir_b, new_dir)
@@ -91,12 +97,13 @@ def main():
     args = parser.parse_args()
 
     arr_path = Path(args.arr_dir) / f"{args.sequence}.npy"
-    arr = np.load(arr_path)
+    arr = np.load(arr_path, mmap_mode="r")
     tracklets_root = Path(args.output_dir) / args.sequence
 
     arr_new, new_tid = merge_tracklets(arr, args.tracklet_id_a, args.tracklet_id_b, str(tracklets_root))
 
-    # overwrite the same npy
+    # overwrite the same npy (release the memory map first)
+    del arr
     np.save(arr_path, arr_new)
 
     print(f"New array shape: {arr_new.shape}")
@@ -1,10 +1,90 @@
 from __future__ import annotations
 import argparse
+import io
+import os
 from pathlib import Path
-import shutil
 import numpy as np
 
 
+def _check_split_args(num_tracks: int, num_frames: int, tid: int, split_frame: int) -> None:
+    if not (1 <= tid < num_tracks):
+        raise ValueError(f"tid out of range: {tid} (valid: 1..{num_tracks-1})")
+    if not (1 <= split_frame < num_frames):
+        raise ValueError(f"split_frame out of range: {split_frame} (valid: 1..{num_frames-1})")
+
+
+def _move_crops(tracklets_root: str, tid: int, new_tid: int, frames: np.ndarray) -> None:
+    """
+    Move the crops of tracklet tid for the given frames into the folder of new_tid.
+    """
+    root = Path(tracklets_root)
+    old_dir = root / f"tracklet_{tid:04d}"
+    new_dir = root / f"tracklet_{new_tid:04d}"
+    new_dir.mkdir(parents=True, exist_ok=True)
+
+    # Crops are named after their frame, so rename exactly those files instead of scanning
+    # the folder (same filesystem, so a plain rename)
+    for frame_id in frames.tolist():
+        name = f"{frame_id:06d}.jpg"
+        try:
+            os.replace(old_dir / name, new_dir / name)
+        except FileNotFoundError:
+            continue  # no crop for this bbox (e.g. fully outside the image)
+
+
+def append_tracklet_row(arr_path: str) -> np.memmap:
+    """
+    Grow a tracklet .npy by one all-NaN tracklet row on disk and memory-map it (r+).
+
+    Tracklets are the outermost axis of the C-ordered array, so the new row is appended to the
+    end of the file and only the header's shape is rewritten (numpy leaves spare header space for
+    this). Falls back to rewriting the whole file when the header cannot be updated in place.
+
+    Args:
+        arr_path (str): Path to the tracklet array of shape (num_tracks+1, num_frames+1, 4).
+
+    Returns:
+        np.memmap: Writable memory map of shape (num_tracks+2, num_frames+1, 4).
+    """
+    path = Path(arr_path)
+    header_io = {
+        (1, 0): (np.lib.format.read_array_header_1_0, np.lib.format.write_array_header_1_0),
+        (2, 0): (np.lib.format.read_array_header_2_0, np.lib.format.write_array_header_2_0),
+    }
+
+    grown = False
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version in header_io:
+            read_header, write_header = header_io[version]
+            shape, fortran_order, dtype = read_header(f)
+            data_offset = f.tell()
+
+            header = io.BytesIO()
+            if not fortran_order and dtype == np.float32:
+                new_shape = (shape[0] + 1, *shape[1:])
+                write_header(header, {"descr": np.lib.format.dtype_to_descr(dtype),
+                                      "fortran_order": False, "shape": new_shape})
+
+            if len(header.getvalue()) == data_offset:
+                # Append the NaN row first, then publish it by updating the shape in the header
+                f.seek(data_offset + int(np.prod(shape)) * dtype.itemsize)
+                f.write(np.full(shape[1:], np.nan, dtype=np.float32).tobytes())
+                f.seek(0)
+                f.write(header.getvalue())
+                grown = True
+
+    if not grown:
+        # The header cannot hold the new shape: rewrite the whole file
+        arr = np.load(path)
+        arr_new = np.empty((arr.shape[0] + 1, *arr.shape[1:]), dtype=np.float32)
+        arr_new[:-1] = arr
+        arr_new[-1] = np.nan
+        np.save(path, arr_new)
+
+    return np.load(path, mmap_mode="r+")
+
+
 def split_tracklet(arr: np.ndarray, tid: int, split_frame: int, tracklets_root: str) -> tuple[np.ndarray, int]:
     """
     Split a tracklet into two at a given frame (inclusive).
@@ -20,40 +100,63 @@ def split_tracklet(arr: np.ndarray, tid: int, split_frame: int, tracklets_root:
         new_tid (int): Newly created splitted tracklet ID.
     """
     num_tracks, num_frames, _ = arr.shape  
-
-    if not (1 <= tid < num_tracks):
-        raise ValueError(f"tid out of range: {tid} (valid: 1..{num_tracks-1})")
-    if not (1 <= split_frame < num_frames):
-        raise ValueError(f"split_frame out of range: {split_frame} (valid: 1..{num_frames-1})")
+    _check_split_args(num_tracks, num_frames, tid, split_frame)
 
     # The new tracklet ID is the last index
     new_tid = num_tracks
 
-    # Expand the array by adding one more tracklet row
-    arr_new = np.full((num_tracks + 1, num_frames, 4), np.nan, dtype=np.float32)
+    # Frames of tid from split_frame onward, i.e. the detections (and crops) that move
+    moved = np.flatnonzero(~np.isnan(arr[tid, split_frame:, 0])) + split_frame
+
+    # Expand the array by adding one more tracklet row; every region is written exactly once
+    arr_new = np.empty((num_tracks + 1, num_frames, 4), dtype=np.float32)
     arr_new[:num_tracks, :, :] = arr
+    if moved.size == 0:
+        # Nothing to move: the new tracklet is simply empty
+        arr_new[new_tid, :, :] = np.nan
+    else:
+        arr_new[new_tid, :split_frame, :] = np.nan
 
-    # Move detections from split_frame onward to the new tracklet
-    arr_new[new_tid, split_frame:, :] = arr_new[tid, split_frame:, :]
-    arr_new[tid, split_frame:, :] = np.nan
+        # Move detections from split_frame onward to the new tracklet (read from the source array)
+        arr_new[new_tid, split_frame:, :] = arr[tid, split_frame:, :]
+        arr_new[tid, split_frame:, :] = np.nan
 
     # Update crops on disk
-    root = Path(tracklets_root)
-    old_dir = root / f"tracklet_{tid:04d}"
-    new_dir = root / f"tracklet_{new_tid:04d}"
-    new_dir.mkdir(parents=True, exist_ok=True)
+    _move_crops(tracklets_root, tid, new_tid, moved)
+
+    return arr_new, new_tid
+
+
+def split_tracklet_npy(arr_path: str, tid: int, split_frame: int, tracklets_root: str) -> tuple[np.memmap, int]:
+    """
+    Same as split_tracklet, but updates the .npy on disk in place, writing only the edited rows.
 
-    if old_dir.exists():
-        # Move images with frame_id >= split_frame
-        for p in old_dir.iterdir():
-            if p.suffix.lower() != ".jpg":
-                continue
-            try:
-                frame_id = int(p.stem)
-            except ValueError:
-                continue
-            if frame_id >= split_frame:
-                shutil.move(str(p), str(new_dir / p.name))
+    Args:
+        arr_path (str): Path to the tracklet array of shape (num_tracks+1, num_frames+1, 4).
+        tid (int): Tracklet ID to split (1-based).
+        split_frame (int): Frame index (1-based) where the split begins (inclusive).
+        tracklets_root (str): Root folder containing per-tracklet folders named as tracklet_XXXX.
+
+    Returns:
+        arr_new (np.memmap): Updated array with one additional tracklet row after splitting.
+        new_tid (int): Newly created splitted tracklet ID.
+    """
+    num_tracks, num_frames, _ = np.load(arr_path, mmap_mode="r").shape
+    _check_split_args(num_tracks, num_frames, tid, split_frame)
+
+    # The new tracklet ID is the last index; its row is appended already NaN-filled
+    arr_new = append_tracklet_row(arr_path)
+    new_tid = num_tracks
+
+    # Move detections from split_frame onward to the new tracklet, touching only the moved cells
+    moved = np.flatnonzero(~np.isnan(arr_new[tid, split_frame:, 0])) + split_frame
+    if moved.size > 0:
+        arr_new[new_tid, moved, :] = arr_new[tid, moved, :]
+        arr_new[tid, moved, :] = np.nan
+        arr_new.flush()
+
+    # Update crops on disk
+    _move_crops(tracklets_root, tid, new_tid, moved)
 
     return arr_new, new_tid
 
@@ -70,13 +173,10 @@ def main():
     args = parser.parse_args()
 
     arr_path = Path(args.arr_dir) / f"{args.sequence}.npy"
-    arr = np.load(arr_path)
     tracklets_root = Path(args.output_dir) / args.sequence
 
-    arr_new, new_tid = split_tracklet(arr, args.tracklet_id, args.split_frame, str(tracklets_root))
-
-    # overwrite the same npy
-    np.save(arr_path, arr_new)
+    # Update the same npy in place
+    arr_new, new_tid = split_tracklet_npy(str(arr_path), args.tracklet_id, args.split_frame, str(tracklets_root))
 
     print(f"New array shape: {arr_new.shape}")
     print(f"New tracklet ID: {new_tid:04d}")
@@ -1,7 +1,6 @@
 import argparse
 from pathlib import Path
 import numpy as np
-import pandas as pd
 from typing import Optional
 
 
@@ -29,18 +28,15 @@ def txt2array(txt_path: str, num_frames: Optional[int] = None, num_tracks: Optio
     if not path.exists():
         raise FileNotFoundError(f"File not found: {path}")
 
-    # Define/parse columns (MOT format compatible)
-    cols = ["frame", "track_id", "x", "y", "w", "h", "score", "i1", "i2", "i3"]
-    df = pd.read_csv(path, header=None, names=cols, usecols=[0, 1, 2, 3, 4, 5])
-
-    # Ensure dtypes
-    df["frame"] = df["frame"].astype(int)
-    df["track_id"] = df["track_id"].astype(int)
-    df[["x", "y", "w", "h"]] = df[["x", "y", "w", "h"]].astype(np.float32)
+    # Parse frame, track_id, x, y, w, h (MOT format compatible) straight into a float32 buffer
+    data = np.loadtxt(path, delimiter=",", usecols=(0, 1, 2, 3, 4, 5), dtype=np.float32, ndmin=2)
+    frames = data[:, 0].astype(np.int32)
+    tracks = data[:, 1].astype(np.int32)
+    boxes = data[:, 2:6]
 
     # Determine sizes if not provided
-    max_frame = int(df["frame"].max()) if not df.empty else 0
-    max_track = int(df["track_id"].max()) if not df.empty else 0
+    max_frame = int(frames.max()) if data.size else 0
+    max_track = int(tracks.max()) if data.size else 0
     if num_frames is None:
         num_frames = max_frame
     if num_tracks is None:
@@ -49,10 +45,12 @@ def txt2array(txt_path: str, num_frames: Optional[int] = None, num_tracks: Optio
     # Initialize with NaNs
     arr = np.full((num_tracks + 1, num_frames + 1, 4), np.nan, dtype=np.float32)
 
-    if not df.empty:
-        frames = df["frame"].to_numpy(dtype=int)
-        tracks = df["track_id"].to_numpy(dtype=int)
-        boxes = df[["x", "y", "w", "h"]].to_numpy(dtype=np.float32)
+    if data.size:
+        # Validate bounds once, before the scatter
+        if frames.min() < 0 or frames.max() > num_frames:
+            raise ValueError(f"frame index out of range: {frames.min()}..{frames.max()} (num_frames={num_frames})")
+        if tracks.min() < 0 or tracks.max() > num_tracks:
+            raise ValueError(f"track_id out of range: {tracks.min()}..{tracks.max()} (num_tracks={num_tracks})")
 
         # Vectorized assignment
         arr[tracks, frames] = boxes
@@ -1,4 +1,7 @@
 import argparse
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import cv2
 
@@ -17,22 +20,37 @@ def video2img(video_path: str, output_dir: str = "img1") -> int:
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    cap = cv2.VideoCapture(video_path)
+    # Let the backend use hardware decoding (NVDEC, VA-API, ...) when available, else software;
+    # OpenCV < 4.5.2 has neither the constants nor the params overload, so open it plainly there
+    try:
+        cap = cv2.VideoCapture(video_path, cv2.CAP_ANY, [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY])
+    except (AttributeError, TypeError):
+        cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open video: {video_path}")
 
+    # Decode on this thread while worker threads encode and write frames (cv2 releases the GIL)
+    max_in_flight = 32  # bounds the decoded frames held in memory
     frame_idx = 1
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break  # End of video
+    try:
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            pending: deque = deque()
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break  # End of video
+                filename = f"{frame_idx:06d}.jpg"
+                filepath = output_path / filename
+                pending.append(executor.submit(cv2.imwrite, str(filepath), frame))
+                frame_idx += 1
+                # Waiting on the oldest write also re-raises its error and stops decoding
+                if len(pending) >= max_in_flight:
+                    pending.popleft().result()
+            for future in pending:
+                future.result()
+    finally:
+        cap.release()
 
-        filename = f"{frame_idx:06d}.jpg"
-        filepath = output_path / filename
-        cv2.imwrite(str(filepath), frame)
-        frame_idx += 1
-
-    cap.release()
     total_frames = frame_idx - 1
     print(f"Saved {total_frames} images to folder: {output_path}")
     return total_frames
@@ -18,16 +18,12 @@ def visualize_array(arr: np.ndarray, seq_name: str, save_path: Optional[str] = N
     num_tracks, num_frames, _ = arr.shape
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    for tid in range(1, num_tracks):  # skip index 0 (padding)
-        has_box = ~np.isnan(arr[tid, :, 0])
-        start = None
-        for f in range(1, num_frames):  # skip index 0 (padding)
-            if has_box[f] and start is None:
-                start = f
-            elif (not has_box[f] or f == num_frames - 1) and start is not None:
-                end = f if has_box[f] else f - 1
-                ax.hlines(tid, start, end, colors="blue", linewidth=2)
-                start = None
+    # Find runs of consecutive frames with a bbox for all tracklets at once (skip index 0 padding)
+    has_box = (~np.isnan(arr[1:, 1:, 0])).astype(np.int8)
+    edges = np.diff(np.pad(has_box, ((0, 0), (1, 1))), axis=1)
+    tids, starts = np.nonzero(edges == 1)  # first frame of each run (0-based)
+    _, ends = np.nonzero(edges == -1)  # one past the last frame of each run (0-based)
+    ax.hlines(tids + 1, starts + 1, ends, colors="blue", linewidth=2)
 
     ax.set_xlabel("Frame ID")
     ax.set_ylabel("Tracklet ID")
@@ -1,9 +1,16 @@
 from __future__ import annotations
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import numpy as np
 import cv2
 
+# JPEG policy for tracklet crops, shared with interpolate_tracklet. Baseline (non-optimized,
+# non-progressive) encoding keeps libjpeg(-turbo) on its fastest path
+JPEG_QUALITY = 85
+JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY, cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+
 
 def visualize_tracklets(arr: np.ndarray, resize_w: int, resize_h: int, img_dir: str, tracklets_root: str) -> None:
     """
@@ -19,40 +26,43 @@ def visualize_tracklets(arr: np.ndarray, resize_w: int, resize_h: int, img_dir:
     tracklets_root_path = Path(tracklets_root)
     tracklets_root_path.mkdir(parents=True, exist_ok=True)
 
-    JPEG_QUALITY = 95
-    num_tracklets, num_frames, _ = arr.shape
     img_dir_path = Path(img_dir)
 
-    for fid in range(1, num_frames):
+    # Complete-bbox mask computed once and shared by every frame (skip index 0 padding);
+    # has_box[:, fid - 1] holds frame fid
+    has_box = ~np.isnan(arr[1:, 1:]).any(axis=-1)
+
+    # Create every tracklet folder once, up front, so worker threads never race on mkdir
+    tracklet_dirs = {}
+    for tid in (np.flatnonzero(np.any(has_box, axis=1)) + 1).tolist():
+        tracklet_dirs[tid] = tracklets_root_path / f"tracklet_{tid:04d}"
+        tracklet_dirs[tid].mkdir(parents=True, exist_ok=True)
+
+    def process_frame(fid: int) -> None:
         img_path = img_dir_path / f"{fid:06d}.jpg"
         if not img_path.exists():
-            continue
+            return
 
         img = cv2.imread(str(img_path))
         if img is None:
-            continue
+            return
 
         H, W = img.shape[:2]
 
-        # Iterate over all tracklets for this frame
-        for tid in range(1, num_tracklets):
-            bbox = arr[tid, fid]
-            if np.any(np.isnan(bbox)):
-                continue  # no bbox for this (tid, fid)
-
-            # Convert bbox to float then to int bounds (floor/ceil)
-            x, y, w, h = bbox.astype(float)
-            x0 = int(np.floor(x))
-            y0 = int(np.floor(y))
-            x1 = int(np.ceil(x + w))
-            y1 = int(np.ceil(y + h))
-
-            # Clamp to image bounds
-            x0 = max(0, min(x0, W - 1))
-            y0 = max(0, min(y0, H - 1))
-            x1 = max(0, min(x1, W))
-            y1 = max(0, min(y1, H))
+        # Gather the bboxes of the tracklets present in this frame
+        tids = np.flatnonzero(has_box[:, fid - 1]) + 1
+        boxes = arr[tids, fid].astype(float)
 
+        # Convert all bboxes to int bounds (floor/ceil) and clamp to image bounds at once
+        bounds = np.stack([
+            np.clip(np.floor(boxes[:, 0]), 0, W - 1),
+            np.clip(np.floor(boxes[:, 1]), 0, H - 1),
+            np.clip(np.ceil(boxes[:, 0] + boxes[:, 2]), 0, W),
+            np.clip(np.ceil(boxes[:, 1] + boxes[:, 3]), 0, H),
+        ], axis=1).astype(int)
+
+        out_name = f"{fid:06d}.jpg"
+        for tid, (x0, y0, x1, y1) in zip(tids.tolist(), bounds.tolist()):
             # Validate after clamping
             if x1 <= x0 or y1 <= y0:
                 continue
@@ -64,13 +74,15 @@ def visualize_tracklets(arr: np.ndarray, resize_w: int, resize_h: int, img_dir:
             # Resize to fixed size
             resized = cv2.resize(crop, (resize_w, resize_h), interpolation=cv2.INTER_AREA)
 
-            # Ensure tracklet folder exists
-            tracklet_dir = tracklets_root_path / f"tracklet_{tid:04d}"
-            tracklet_dir.mkdir(parents=True, exist_ok=True)
+            out_path = tracklet_dirs[tid] / out_name
+            cv2.imwrite(str(out_path), resized, JPEG_PARAMS)
+
+    # Only decode frames where at least one tracklet has a bbox
+    active_frames = (np.flatnonzero(np.any(has_box, axis=0)) + 1).tolist()
 
-            out_name = f"{fid:06d}.jpg"
-            out_path = tracklet_dir / out_name
-            cv2.imwrite(str(out_path), resized, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    # Decode, crop and encode frames in parallel (cv2 releases the GIL); arr is only read
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(process_frame, active_frames))
 
     print(f"All crops ({resize_w}*{resize_h}) saved under: {tracklets_root_path}")
 